@@ -2,6 +2,68 @@ from model.models import AgentState
 from util import is_job_detail_url, with_retry_and_rate_limit, parse_date_string
 import logging
 logger = logging.getLogger(__name__)
+
+# Cap on concurrent browser+LLM extractions; each task still goes through
+# with_retry_and_rate_limit, the semaphore only bounds how many are in flight
+EXTRACTION_CONCURRENCY = 8
+
+
+async def batch_job_info_extractor_agent(state: AgentState) -> AgentState:
+    """
+    Drain all job-detail URLs from the queue and extract them concurrently
+    under a bounded semaphore instead of one URL per graph step
+    """
+    if not state.links_to_visit:
+        return state
+
+    # Only collect as many URLs as we still need jobs for
+    remaining = max(state.max_job - state.jobs_count, 0)
+    if remaining == 0:
+        return state
+
+    job_urls = []
+    passed_over = []
+    while len(job_urls) < remaining:
+        url = state.pop_next()
+        if url is None:
+            break
+        if is_job_detail_url(url):
+            job_urls.append(url)
+        else:
+            passed_over.append(url)
+
+    # Put non-job links back in their original order
+    state.requeue_front(passed_over)
+
+    if not job_urls:
+        return state
+
+    print(f"📄 Extracting job info from {len(job_urls)} URLs (concurrency={EXTRACTION_CONCURRENCY})")
+
+    semaphore = asyncio.BoundedSemaphore(EXTRACTION_CONCURRENCY)
+
+    async def _extract(url: str):
+        async with semaphore:
+            return await with_retry_and_rate_limit(
+                state,
+                extract_job_details_modern,
+                url,
+                state.user_job_preference
+            )
+
+    results = await asyncio.gather(*(_extract(url) for url in job_urls))
+
+    for url, job_info in zip(job_urls, results):
+        if job_info:
+            state.add_job(job_info)
+            print(f"✅ Added job: {job_info.title} at {job_info.company}")
+        else:
+            print(f"❌ Failed to extract job info from {url}")
+        state.mark_visited(url)
+
+    return state
+
+
 async def job_info_extractor_agent(state: AgentState) -> AgentState:
     """
     Extract job information from specific job posting URL using structured output
@@ -13,21 +75,19 @@ async def job_info_extractor_agent(state: AgentState) -> AgentState:
     job_url = None
     temp_links = []
 
-    while state.links_to_visit:
-        url = state.links_to_visit.popleft()
+    while True:
+        url = state.pop_next()
+        if url is None:
+            break
         if is_job_detail_url(url):
             job_url = url
-            # Put remaining links back
-            for remaining in temp_links:
-                state.links_to_visit.appendleft(remaining)
             break
-        else:
-            temp_links.append(url)
+        temp_links.append(url)
+
+    # Put passed-over links back in their original order
+    state.requeue_front(temp_links)
 
     if not job_url:
-        # Put all links back and return
-        for link in temp_links:
-            state.links_to_visit.appendleft(link)
         return state
 
     state.current_page_url = job_url
@@ -50,9 +110,8 @@ async def job_info_extractor_agent(state: AgentState) -> AgentState:
     state.mark_visited(job_url)
     return state
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
-from langchain_community.document_loaders import AsyncChromiumLoader
-from langchain_community.document_transformers import BeautifulSoupTransformer
+from bs4 import BeautifulSoup
+from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 import asyncio
 import re
@@ -61,41 +120,137 @@ import re
 from model.models import JobInfo, JobExtraction
 from typing import  Optional
 from langchain_community.document_transformers import Html2TextTransformer
+from util import extraction_cache
+from util import llm_batcher
+from util.browser_pool import get_browser
+from util.llm import get_job_extractor
+
+try:
+    import tiktoken
+    # encoding_for_model downloads the BPE file on first use, so this can
+    # fail for reasons beyond a missing package (network, unknown model) -
+    # any failure means the char-based fallback, not an import error
+    _TOKEN_ENCODER = tiktoken.encoding_for_model("gpt-4o-mini")
+except Exception:
+    _TOKEN_ENCODER = None
+
+# Hard ceiling on page-content tokens per extraction prompt; one huge page
+# must never blow through the context window (cost is charged regardless)
+MAX_CONTENT_TOKENS = 6000
+
+
+def truncate_to_token_budget(text: str, max_tokens: int = MAX_CONTENT_TOKENS) -> str:
+    """Truncate text to a token budget (approximate if tiktoken is missing)"""
+    if _TOKEN_ENCODER is None:
+        # ~4 chars per token is a safe over-estimate for English text
+        return text[:max_tokens * 4]
+    tokens = _TOKEN_ENCODER.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    logger.debug(f"✂️ Truncating page content: {len(tokens)} -> {max_tokens} tokens")
+    return _TOKEN_ENCODER.decode(tokens[:max_tokens])
+
+
+# Keywords that mark the job-posting block of a page; chunks are scored by
+# how many matches they contain so boilerplate (nav, footer) ranks last
+_RELEVANCE_RE = re.compile(
+    r"apply|responsibilit|requirement|qualification|salary|benefit|posted|"
+    r"experience|remote|full.?time|part.?time",
+    re.IGNORECASE,
+)
+
+
+def select_relevant_chunks(page_content: str, max_chunks: int = 3) -> str:
+    """
+    Cheap local pass: split the page into chunks and keep only the ones that
+    look like the job posting, so the LLM never sees page boilerplate
+    """
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1500, chunk_overlap=100)
+    chunks = splitter.split_text(page_content)
+    if len(chunks) <= max_chunks:
+        return page_content
+
+    scored = sorted(
+        ((len(_RELEVANCE_RE.findall(chunk)), index, chunk)
+         for index, chunk in enumerate(chunks)),
+        reverse=True,
+    )
+    # Restore document order so the prompt reads naturally
+    top = sorted(scored[:max_chunks], key=lambda item: item[1])
+    logger.debug(f"✂️ Kept {max_chunks}/{len(chunks)} chunks for extraction")
+    return "\n\n".join(chunk for _, _, chunk in top)
+
 
 async def extract_job_details_modern(url: str, user_preference: str) -> Optional[JobInfo]:
     """
     Extract job details using modern LangChain with_structured_output method
     """
     try:
-        # Step 1: Load page content
+        # Step 1: Load page content via the shared browser pool
         logger.debug("📥 Loading page content...")
-        loader = AsyncChromiumLoader([url])
-        docs = await asyncio.to_thread(loader.load)
+        browser = await get_browser()
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(url, wait_until="networkidle", timeout=30000)
+            html = await page.content()
+        finally:
+            await context.close()
+        # Strip script/style/nav/footer noise and keep the content root so the
+        # text conversion (and with it the LLM prompt) skips page chrome
+        soup = BeautifulSoup(html, "html.parser")
+        for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
+            tag.decompose()
+        content_root = soup.find("article") or soup.find("main") or soup.body or soup
+        html = str(content_root)
+
+        docs = [Document(page_content=html, metadata={"source": url})]
         html2text = Html2TextTransformer(ignore_links=False)
         docs_transformed = html2text.transform_documents(docs)
-        page_content = docs_transformed[0].page_content
+        # Safety valve against pathological pages
+        page_content = docs_transformed[0].page_content[:20000]
 
-        # Step 4: Initialize LLM with structured output
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        structured_llm = llm.with_structured_output(JobExtraction)
+        # Step 2: Keep only the chunks that look like the job posting - this
+        # cuts prompt tokens by an order of magnitude on boilerplate-heavy pages
+        page_content = select_relevant_chunks(page_content)
+        page_content = truncate_to_token_budget(page_content)
 
-        # Step 5: Create extraction prompt
-        extraction_prompt = f"""
-        Extract job information from the following webpage content.
+        # Step 3: Check the content-addressable cache before spending an LLM call
+        cache_key = extraction_cache.make_key("gpt-4o-mini", page_content, user_preference)
+        cached = extraction_cache.get(cache_key)
+        if cached is not None:
+            result = JobExtraction.model_validate(cached)
+        else:
+            # Step 4: Create extraction prompt with a schema hint so the model
+            # still fills the full structure even from excerpted content
+            schema_hint = ", ".join(JobExtraction.model_fields.keys())
+            extraction_prompt = f"""
+            Extract job information from the following webpage content.
+            The content is an excerpt; extract these fields: {schema_hint}.
 
-        User is looking for: {user_preference}
+            User is looking for: {user_preference}
 
-        Webpage Content:
-        {page_content}
+            Webpage Content:
+            {page_content}
 
-        Please extract all available job information. If information is not available, use appropriate defaults.
-        Focus on accuracy and only extract information that is clearly present in the content.
-        """
+            Please extract all available job information. If information is not available, use appropriate defaults.
+            Focus on accuracy and only extract information that is clearly present in the content.
+            """
 
-        # Step 6: Extract structured data
-        result = structured_llm.invoke(extraction_prompt)
+            # Step 5: Extract structured data - via the Batch API when enabled
+            # (non-streaming runs), otherwise the regular online call
+            if llm_batcher.is_enabled():
+                result = await llm_batcher.get_batcher().submit(extraction_prompt, JobExtraction)
+            else:
+                # The prebuilt-schema runnable yields a plain dict; ainvoke
+                # keeps the LLM round trip off the event loop so sibling
+                # extraction tasks and page loads keep running
+                result = JobExtraction.model_validate(
+                    await get_job_extractor().ainvoke(extraction_prompt)
+                )
+            extraction_cache.put(cache_key, result.model_dump())
 
-        # Step 7: Convert to JobInfo object
+        # Step 6: Convert to JobInfo object
         job_info = JobInfo(
             title=result.job_title,
             company=result.company_name,
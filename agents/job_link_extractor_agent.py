@@ -2,12 +2,28 @@ from typing import Optional, Dict, List
 
 
 from model.models import AgentState, LinkCategorization
-from util import with_retry_and_rate_limit
-from langchain_openai import ChatOpenAI
-from urllib.parse import urlparse
+import hashlib
+
+from util import with_retry_and_rate_limit, classify_link_heuristic, extract_host
+from util import extraction_cache
+from util import llm_batcher
+from util.llm import get_link_categorizer
 import logging
 logger = logging.getLogger(__name__)
-from playwright.async_api import async_playwright
+from util.browser_pool import get_browser
+from util.static_fetch import fetch_static_links
+
+# In-process cache of categorization results keyed by the page's link set;
+# paginated listings share most links, so hit rates on /jobs?page=N are high
+_categorization_cache: Dict[str, Dict[str, List[str]]] = {}
+
+
+def _categorization_cache_key(links: List[Dict[str, str]], user_preference: str) -> str:
+    """Hash of the sorted unique link URLs plus the user preference"""
+    raw = b"\x00".join(sorted(link['href'].encode() for link in links))
+    raw += b"\x00" + user_preference.encode()
+    return "links-" + hashlib.blake2b(raw, digest_size=16).hexdigest()
+
 
 async def job_link_extractor_agent(state: AgentState) -> AgentState:
     """
@@ -16,7 +32,9 @@ async def job_link_extractor_agent(state: AgentState) -> AgentState:
     if not state.links_to_visit:
         return state
 
-    current_url = state.links_to_visit.popleft()
+    current_url = state.pop_next()
+    if current_url is None:
+        return state
     state.current_page_url = current_url
 
     print(f"🔍 Extracting links from: {current_url}")
@@ -46,79 +64,117 @@ async def job_link_extractor_agent(state: AgentState) -> AgentState:
     state.mark_visited(current_url)
     return state
 
+async def _load_links_with_browser(url: str) -> List[Dict[str, str]]:
+    """Render the page in the shared browser and extract its link set"""
+    logger.debug("🌐 Loading page with Playwright...")
+    browser = await get_browser()
+    context = await browser.new_context(
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    )
+    try:
+        page = await context.new_page()
+        # domcontentloaded instead of networkidle - the latter stalls on
+        # analytics-heavy sites long after the content is usable
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+
+        # ⭐ Event-driven waits instead of fixed sleeps: scroll to trigger
+        # lazy loading, then wait for browser idle rather than a timer
+        await page.evaluate("""
+            async () => {
+                window.scrollTo(0, document.body.scrollHeight);
+                await new Promise(resolve =>
+                    requestIdleCallback(resolve, {timeout: 2000}));
+                window.scrollTo(0, 0);
+            }
+        """)
+
+        # Make sure anchors actually rendered before extracting
+        try:
+            await page.wait_for_function(
+                "document.querySelectorAll('a[href]').length > 0", timeout=5000
+            )
+        except Exception:
+            logger.debug("⏱️ No anchors appeared within 5s, extracting anyway")
+
+        # Extract links with context - dedup and the same-domain filter
+        # run in the browser so external/duplicate links never cross CDP
+        logger.debug("🔗 Extracting links from page...")
+
+        base_domain = extract_host(url)
+        return await page.evaluate("""
+            (baseHost) => {
+                const seen = new Map();
+                for (const a of document.querySelectorAll('a[href]')) {
+                    const href = a.href;
+                    const text = a.textContent.trim();
+                    if (!href || !text || !href.startsWith('http')) continue;
+                    let host;
+                    try { host = new URL(href).host; } catch (e) { continue; }
+                    if (host !== baseHost) continue;
+                    const context = a.closest('div,section,article')?.textContent.slice(0, 200) || '';
+                    const prev = seen.get(href);
+                    if (!prev || text.length > prev.text.length || context.length > prev.context.length) {
+                        seen.set(href, {href, text, context});
+                    }
+                }
+                return [...seen.values()];
+            }
+        """, base_domain)
+    finally:
+        # Close only our context; the shared browser stays warm for reuse
+        await context.close()
+
+
 async def extract_page_links_modern(url: str, user_preference: str) -> Optional[Dict[str, List[str]]]:
     """
     Extract and categorize links using modern structured output
     """
     try:
-        # Load page and extract links with context
-        logger.debug("🌐 Loading page with Playwright...")
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
-            page = await context.new_page()
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-
-            # ⭐ NEW: Wait for dynamic content and scroll to trigger lazy loading
-            await page.wait_for_timeout(3000)  # Wait for JS to load
-
-            # Scroll to bottom to trigger lazy loading
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(2000)
-
-            # Scroll back to top
-            await page.evaluate("window.scrollTo(0, 0)")
-            await page.wait_for_timeout(1000)
-
-            # Extract links with context
-            logger.debug("🔗 Extracting links from page...")
-
-            links_data = await page.evaluate("""
-                () => {
-                    const links = Array.from(document.querySelectorAll('a[href]'));
-                    return links.map(link => ({
-                        href: link.href,
-                        text: link.textContent.trim(),
-                        context: link.closest('div,section,article')?.textContent.slice(0, 200) || ''
-                    })).filter(link => link.href && link.text && link.href.startsWith('http'));
-                }
-            """)
-            await browser.close()
+        # ⭐ Cheap static probe first: server-rendered job boards don't need
+        # a browser at all, which skips startup plus the scroll/settle waits
+        links_data = await fetch_static_links(url)
+        if links_data is None:
+            links_data = await _load_links_with_browser(url)
+
         logger.debug(f"RAW LINKS: {links_data}")
-        logger.info(f"📊 Found {len(links_data)} total links on page")
-
-        base_domain = urlparse(url).netloc
-        # Group links by URL to remove duplicates but keep best metadata
-        unique_links = {}
-        for link in links_data:
-            href = link['href']
-            if href not in unique_links:
-                unique_links[href] = link
+        # Already deduped and same-domain filtered at the source
+        filtered_links = links_data
+        logger.info(f"🏠 Found {len(filtered_links)} unique same-domain links on page")
+
+        # ⭐ Semantic cache: pages sharing (almost) the same link set reuse a
+        # previous categorization - in process first, then the opt-in disk cache
+        cache_key = _categorization_cache_key(filtered_links, user_preference)
+        cached = _categorization_cache.get(cache_key)
+        if cached is None:
+            cached = extraction_cache.get(cache_key)
+        if cached is not None:
+            _categorization_cache[cache_key] = cached
+            logger.info("💾 Link categorization served from cache")
+            return cached
+
+        # ⭐ NEW: Label unambiguous links locally so only the ambiguous ones
+        # reach the LLM - cuts prompt size ~5-10x on link-heavy pages
+        definite = {"job_detail_links": [], "job_listing_pages": [], "navigation_links": []}
+        ambiguous = []
+        for link in filtered_links:
+            label = classify_link_heuristic(link['href'], link['text'])
+            if label == "job_detail":
+                definite["job_detail_links"].append(link['href'])
+            elif label == "listing":
+                definite["job_listing_pages"].append(link['href'])
+            elif label == "nav":
+                definite["navigation_links"].append(link['href'])
+            elif label == "skip":
+                continue
             else:
-                # Keep the link with more text/context
-                existing = unique_links[href]
-                if len(link['text']) > len(existing['text']) or len(link['context']) > len(existing['context']):
-                    unique_links[href] = link
-
-        # Filter same-domain links
+                ambiguous.append(link)
 
-        filtered_links = []
-        for link in unique_links.values():
-            link_domain = urlparse(link['href']).netloc
+        logger.info(f"🔎 Heuristic prefilter: "
+                    f"{sum(len(v) for v in definite.values())} definite, "
+                    f"{len(ambiguous)} ambiguous links")
 
-            # Only keep same-domain links
-            if link_domain == base_domain:
-                filtered_links.append(link)
-            else:
-                logger.debug(f"🚫 Skipping external link: {link['href']} (domain: {link_domain})")
-
-        logger.info(f"🏠 Filtered to {len(filtered_links)} same-domain links (removed external links)")
-        # Use modern structured output for link categorization
-        logger.debug("🤖 Initializing LLM for advanced link categorization...")
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        structured_llm = llm.with_structured_output(LinkCategorization)
+        if not ambiguous:
+            return definite
 
         # ⭐ NEW: Create enhanced links text for analysis with more metadata
         links_text = "\n".join([
@@ -126,7 +182,7 @@ async def extract_page_links_modern(url: str, user_preference: str) -> Optional[
             f"Text: {link['text']}\n"
             f"Context: {link['context'][:100]}\n"
             f"---"
-            for link in filtered_links  # Analyze top 30 links
+            for link in ambiguous[:30]  # Analyze top 30 ambiguous links
         ])
 
         categorization_prompt = f"""
@@ -152,14 +208,33 @@ async def extract_page_links_modern(url: str, user_preference: str) -> Optional[
                """
 
         logger.debug("🧠 Running enhanced LLM categorization...")
-        categorized = structured_llm.invoke(categorization_prompt)
+        # Use modern structured output for link categorization - via the
+        # Batch API when enabled (non-streaming runs), otherwise online
+        if llm_batcher.is_enabled():
+            categorized = await llm_batcher.get_batcher().submit(
+                categorization_prompt, LinkCategorization
+            )
+        else:
+            # The prebuilt-schema runnable yields a plain dict; ainvoke
+            # keeps the LLM round trip off the event loop so concurrent
+            # page loads and extractions aren't stalled behind it
+            categorized = LinkCategorization.model_validate(
+                await get_link_categorizer().ainvoke(categorization_prompt)
+            )
 
+        # Merge the LLM's verdict on ambiguous links with the definite buckets
         result = {
-            "job_detail_links": categorized.job_detail_links,
-            "job_listing_pages": categorized.job_listing_pages,
-            "navigation_links": categorized.navigation_links
+            "job_detail_links": list(dict.fromkeys(
+                definite["job_detail_links"] + categorized.job_detail_links)),
+            "job_listing_pages": list(dict.fromkeys(
+                definite["job_listing_pages"] + categorized.job_listing_pages)),
+            "navigation_links": list(dict.fromkeys(
+                definite["navigation_links"] + categorized.navigation_links))
         }
 
+        _categorization_cache[cache_key] = result
+        extraction_cache.put(cache_key, result)
+
         total_categorized = sum(len(links) for links in result.values())
         logger.info(f"✅ Categorized {total_categorized} relevant links: "
                     f"{len(result['job_detail_links'])} job details, "
@@ -3,10 +3,12 @@ import asyncio
 from langgraph.constants import END
 from langgraph.graph import StateGraph
 
-from agents.job_info_extractor_agent import job_info_extractor_agent
-from agents.job_link_extractor_agent import job_link_extractor_agent
+from agents.job_info_extractor_agent import batch_job_info_extractor_agent, extract_job_details_modern
+from agents.job_link_extractor_agent import job_link_extractor_agent, extract_page_links_modern
 from model.models import AgentState
-from util import is_job_detail_url
+from model.run_context import get_context, release_context
+from util import is_job_detail_url, with_retry_and_rate_limit
+from util.browser_pool import close_browser
 from dotenv import load_dotenv
 import logging
 load_dotenv()
@@ -54,7 +56,7 @@ def create_job_scraper_graph():
 
     # Add nodes
     workflow.add_node("job_link_extractor", job_link_extractor_agent)
-    workflow.add_node("job_info_extractor", job_info_extractor_agent)
+    workflow.add_node("job_info_extractor", batch_job_info_extractor_agent)
     workflow.add_node("route_decision", route_decision_node)
 
     # Define entry point
@@ -78,6 +80,119 @@ def create_job_scraper_graph():
     return workflow.compile()
 
 
+async def run_pipeline(state: AgentState, link_workers: int = 2, info_workers: int = 6) -> AgentState:
+    """
+    Run the scrape as a direct asyncio producer/consumer pipeline.
+
+    Link workers pull pages from the state queue and feed discovered
+    job-detail URLs into an asyncio.Queue; info workers consume it and
+    extract jobs concurrently. This skips the per-URL round trip through
+    the graph's routing node, so I/O on both stages overlaps freely.
+
+    Args:
+        state: Initialized AgentState
+        link_workers: Concurrent page/link extraction tasks
+        info_workers: Concurrent job-detail extraction tasks
+    """
+    job_queue: asyncio.Queue = asyncio.Queue()
+    done = asyncio.Event()
+    pages_in_flight = 0
+    jobs_in_flight = 0
+
+    def next_page_url():
+        """Pop the next listing/nav URL, routing job-detail URLs to the queue"""
+        while True:
+            url = state.pop_next()
+            if url is None:
+                return None
+            if is_job_detail_url(url):
+                job_queue.put_nowait(url)
+                continue
+            return url
+
+    async def link_worker():
+        nonlocal pages_in_flight
+        while not done.is_set():
+            url = next_page_url()
+            if url is None:
+                # No page work left anywhere: signal completion
+                if pages_in_flight == 0 and job_queue.empty():
+                    done.set()
+                    break
+                await asyncio.sleep(0.2)
+                continue
+
+            pages_in_flight += 1
+            try:
+                page_data = await with_retry_and_rate_limit(
+                    state, extract_page_links_modern, url, state.user_job_preference
+                )
+                if page_data:
+                    # Single dedup point: everything goes through the state
+                    # queue, next_page_url reroutes job URLs to the workers
+                    state.add_links_to_visit(
+                        page_data.get('job_detail_links', [])
+                        + page_data.get('job_listing_pages', [])
+                        + page_data.get('navigation_links', [])[:3]
+                    )
+            finally:
+                pages_in_flight -= 1
+                state.mark_visited(url)
+
+    async def info_worker():
+        nonlocal jobs_in_flight
+        while not done.is_set():
+            try:
+                url = await asyncio.wait_for(job_queue.get(), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue
+            # Reserve a slot under the cap before paying for an extraction:
+            # counting in-flight extractions keeps concurrent workers from
+            # collectively overshooting max_job (and from spending LLM and
+            # browser time on jobs the caller never asked for)
+            if state.jobs_count + jobs_in_flight >= state.max_job:
+                job_queue.put_nowait(url)  # kept for a slot freed by a failure
+                await asyncio.sleep(0.2)
+                continue
+            jobs_in_flight += 1
+            try:
+                job_info = await with_retry_and_rate_limit(
+                    state, extract_job_details_modern, url, state.user_job_preference
+                )
+                if job_info:
+                    state.add_job(job_info)
+                state.mark_visited(url)
+            finally:
+                jobs_in_flight -= 1
+            if state.jobs_count >= state.max_job:
+                done.set()
+
+    async def coordinator():
+        while not done.is_set():
+            if (state.jobs_count >= state.max_job
+                    or state.error_count >= state.max_errors):
+                done.set()
+                break
+            await asyncio.sleep(0.2)
+
+    logger.info(f"🚀 Running pipeline: {link_workers} link workers, {info_workers} info workers")
+    workers = (
+        [asyncio.create_task(link_worker()) for _ in range(link_workers)]
+        + [asyncio.create_task(info_worker()) for _ in range(info_workers)]
+        + [asyncio.create_task(coordinator())]
+    )
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        # The run owns the shared browser's lifecycle: shut it down cleanly
+        # instead of letting the event loop tear down with it still attached
+        await close_browser()
+
+    logger.info(f"🏁 Pipeline finished: {state.jobs_count}/{state.max_job} jobs, "
+                f"{len(state.links_visited)} pages visited")
+    return state
+
+
 async def stream_job_scraper(website: str, user_job_preference: str, max_jobs: int = 5):
     """
     Stream the job scraper execution with real-time updates
@@ -103,24 +218,33 @@ async def stream_job_scraper(website: str, user_job_preference: str, max_jobs: i
     logger.info(f"📊 Max jobs: {max_jobs}")
     logger.info("=" * 80)
 
+    # astream yields {node_name: dict-of-updated-fields}, not an AgentState,
+    # so progress counters are read through the shared run context instead
+    ctx = get_context(initial_state.run_id)
+
     try:
         # Stream the workflow execution
         async for event in graph.astream(initial_state):
 
-            # Extract node name and state from event
-            node_name = list(event.keys())[0] if event else "unknown"
-            current_state = list(event.values())[0] if event else None
+            node_name = next(iter(event), "unknown") if event else "unknown"
 
-            if current_state:
-                # Stream update with current status
-                print(f"\n ✅ state: {current_state}")
+            # Stream a compact summary - repr'ing the full state walks
+            # every job and link collected so far on each event
+            print(f"✅ {node_name}: "
+                  f"jobs={len(ctx.jobs_found)}/{max_jobs} "
+                  f"queued={len(ctx.links_to_visit)} "
+                  f"visited={len(ctx.links_visited)}")
 
-                # Add delay for better readability
-                #await asyncio.sleep(0.5)
+        return ctx.jobs_found
 
     except Exception as e:
         logger.error(f"❌ Streaming error: {str(e)}")
         print(f"\n❌ ERROR: {str(e)}")
         return []
+    finally:
+        await close_browser()
+        # The jobs list survives as the return value; the rest of the run's
+        # collections can be dropped now that the crawl is over
+        release_context(initial_state.run_id)
 
 
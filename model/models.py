@@ -1,5 +1,5 @@
 import asyncio
-from collections import deque
+import uuid
 from datetime import datetime
 from typing import List, Set, Deque, Optional, Any
 
@@ -7,6 +7,14 @@ from pydantic import BaseModel, Field
 import logging
 logger = logging.getLogger(__name__)
 
+from model.run_context import RunCollections, get_context
+
+
+def _normalize(url: str) -> str:
+    # Imported lazily: util imports AgentState from this module at load time
+    from util import normalize_url
+    return normalize_url(url)
+
 # =============================================================================
 # PYDANTIC MODELS
 # =============================================================================
@@ -32,9 +40,10 @@ class AgentState(BaseModel):
     max_errors: int = 10
 
     # ── dynamic / mutable slices ────────────────────────────
-    links_to_visit: Deque[str] = Field(default_factory=deque)
-    links_visited: Set[str] = Field(default_factory=set)
-    jobs_found: List[JobInfo] = Field(default_factory=list)
+    # The growing collections live in a module-level RunContext keyed by
+    # run_id, so LangGraph only serializes small scalars between nodes
+    # instead of deep-copying the deque/set/job list on every transition
+    run_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
 
     # ── tracking fields ──────────────────────────────────────
     current_page_url: Optional[str] = None
@@ -44,13 +53,43 @@ class AgentState(BaseModel):
     status_message: str = "Initializing..."
     step_count: int = 0
 
-    class Config:
-        arbitrary_types_allowed = True
+    # ── shared run collections ───────────────────────────────
+    @property
+    def _ctx(self) -> RunCollections:
+        return get_context(self.run_id)
+
+    @property
+    def links_to_visit(self) -> Deque[str]:
+        return self._ctx.links_to_visit
+
+    @property
+    def links_to_visit_set(self) -> Set[str]:
+        return self._ctx.links_to_visit_set
+
+    @property
+    def links_visited(self) -> Set[str]:
+        return self._ctx.links_visited
+
+    @property
+    def jobs_found(self) -> List[JobInfo]:
+        return self._ctx.jobs_found
+
+    @property
+    def normalized_queue(self) -> Set[str]:
+        return self._ctx.normalized_queue
+
+    @property
+    def normalized_visited(self) -> Set[str]:
+        return self._ctx.normalized_visited
 
     def model_post_init(self, __context: Any) -> None:
         """Initialize with main website URL"""
-        if self.website not in self.links_visited:
+        # Guard both collections: LangGraph reconstructs the state between
+        # nodes and the shared context must only be seeded once per run
+        if (self.website not in self.links_visited
+                and self.website not in self.links_to_visit_set):
             self.links_to_visit.append(self.website)
+            self.links_to_visit_set.add(self.website)
             logger.info(f"🌐 Added starting website to queue: {self.website}")
 
     @property
@@ -86,32 +125,49 @@ class AgentState(BaseModel):
 
     def add_job(self, job: JobInfo) -> None:
         """Add job if not duplicate and under limit"""
-        if job.source_url not in [j.source_url for j in self.jobs_found]:
-            self.jobs_found.append(job)
-            logger.info(f"✅ Job added: {job.title} at {job.company}")
-        else:
+        ctx = self._ctx
+        if job.source_url in ctx.job_urls:
             logger.warning(f"⚠️ Duplicate job skipped: {job.title}")
+            return
+        ctx.job_urls.add(job.source_url)
+        ctx.jobs_found.append(job)
+        logger.info(f"✅ Job added: {job.title} at {job.company}")
 
     def add_links_to_visit(self, links: List[str]) -> None:
         """Add new links to queue, avoiding duplicates"""
         new_count = 0
         for link in links:
-            if link not in self.links_visited and link not in self.links_to_visit:
+            if link not in self.links_visited and link not in self.links_to_visit_set:
                 self.links_to_visit.append(link)
+                self.links_to_visit_set.add(link)
+                self.normalized_queue.add(_normalize(link))
                 new_count += 1
         if new_count > 0:
             logger.info(f"🔗 Added {new_count} new links to queue")
 
+    def pop_next(self) -> Optional[str]:
+        """Pop the next live URL from the queue, skipping tombstones"""
+        while self.links_to_visit:
+            url = self.links_to_visit.popleft()
+            if url in self.links_visited or url not in self.links_to_visit_set:
+                continue  # tombstone left by mark_visited
+            self.links_to_visit_set.discard(url)
+            return url
+        return None
+
+    def requeue_front(self, links: List[str]) -> None:
+        """Put popped-but-unprocessed links back at the front of the queue"""
+        for link in reversed(links):
+            self.links_to_visit.appendleft(link)
+            self.links_to_visit_set.add(link)
+
     def mark_visited(self, url: str) -> None:
-        """Mark URL as visited"""
+        """Mark URL as visited; any queue entry becomes a tombstone"""
         self.links_visited.add(url)
-        if url in self.links_to_visit:
-            temp_deque = deque()
-            while self.links_to_visit:
-                item = self.links_to_visit.popleft()
-                if item != url:
-                    temp_deque.append(item)
-            self.links_to_visit = temp_deque
+        self.links_to_visit_set.discard(url)
+        normalized = _normalize(url)
+        self.normalized_visited.add(normalized)
+        self.normalized_queue.discard(normalized)
         logger.debug(f"✓ Marked as visited: {url}")
 
     def record_error(self, error: str) -> None:
@@ -0,0 +1,46 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Deque, Dict, List, Set
+
+import logging
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from model.models import JobInfo
+
+
+@dataclass
+class RunCollections:
+    """
+    Mutable crawl collections for one run, shared by all graph nodes.
+
+    LangGraph serializes the Pydantic state between nodes; keeping the
+    growing deque/set/list collections here (keyed by run_id) means only
+    small scalars cross node boundaries.
+    """
+    links_to_visit: Deque[str] = field(default_factory=deque)
+    links_to_visit_set: Set[str] = field(default_factory=set)
+    links_visited: Set[str] = field(default_factory=set)
+    # Normalized mirrors, maintained at insertion time so link validation
+    # never has to re-normalize the full collections
+    normalized_queue: Set[str] = field(default_factory=set)
+    normalized_visited: Set[str] = field(default_factory=set)
+    jobs_found: List["JobInfo"] = field(default_factory=list)
+    job_urls: Set[str] = field(default_factory=set)
+
+
+_contexts: Dict[str, RunCollections] = {}
+
+
+def get_context(run_id: str) -> RunCollections:
+    """Return the shared collections for a run, creating them on first use"""
+    ctx = _contexts.get(run_id)
+    if ctx is None:
+        ctx = _contexts.setdefault(run_id, RunCollections())
+        logger.debug(f"🗂️ Created run context: {run_id}")
+    return ctx
+
+
+def release_context(run_id: str) -> None:
+    """Drop a run's collections once its results are no longer needed"""
+    _contexts.pop(run_id, None)
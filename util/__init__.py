@@ -0,0 +1,484 @@
+import asyncio
+import functools
+import os
+import random
+import re
+
+from dotenv import load_dotenv
+
+
+from model.models import AgentState
+from datetime import datetime, timedelta
+from typing import List, Optional, Set, Tuple
+
+
+
+import logging
+import logging.handlers
+import queue
+logger = logging.getLogger(__name__)
+from urllib.parse import urlparse, urlsplit, urlunsplit
+
+try:
+    from furl import furl as _furl
+except ImportError:
+    _furl = None
+
+try:
+    from dateutil import parser as _dateutil_parser
+except ImportError:
+    _dateutil_parser = None
+
+# Single precompiled alternation covering every skip pattern - one regex
+# dispatch per link instead of a dozen re.search calls. Non-HTTP protocols
+# (javascript:, mailto:, ...) need no pattern: the _ALLOWED_SCHEMES prefix
+# check already rejects them
+_SKIP_RE = re.compile(
+    r'(?:\.(?:pdf|doc|zip|exe)$)'        # File downloads
+    r'|(?:/(?:api|ajax|wp-admin|admin|print)/)'  # API/admin/print endpoints
+    r'|(?:#$)|(?:\?print=)',             # Fragment-only / print versions
+    re.IGNORECASE,
+)
+
+_ALLOWED_SCHEMES = ('http://', 'https://')
+
+# O(1) lookup when filtering query params, vs a per-param list scan
+_TRACKING_PARAMS = frozenset({
+    'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
+    'fbclid', 'gclid', 'msclkid', 'ref', 'source', 'campaign',
+    'sessionid', 'jsessionid', 'phpsessid', '_ga', '_gid',
+})
+
+# Cheap "dirty mask" markers for the normalize_url fast path, derived from
+# _TRACKING_PARAMS so the two paths can never disagree on which parameters
+# count as tracking. Bare names (no '=') over-match into substrings like
+# 'resource', but a false positive just takes the full normalizer - only a
+# false negative would split one canonical URL into two
+_TRACKING_MARKERS = ('utm_',) + tuple(
+    sorted(p for p in _TRACKING_PARAMS if not p.startswith('utm_'))
+)
+
+
+def _leading_int(text: str) -> Optional[int]:
+    """Accumulate the first run of digits without invoking the regex engine;
+    None when the string contains no digits"""
+    acc = 0
+    seen_digit = False
+    for c in text:
+        if c.isdigit():
+            acc = acc * 10 + (ord(c) - 48)
+            seen_digit = True
+        elif seen_digit:
+            break
+    return acc if seen_digit else None
+
+
+def parse_date_string(date_str: Optional[str]) -> Optional[datetime]:
+    """Parse date string to datetime object"""
+    if not date_str:
+        return None
+
+    try:
+        # Handle relative dates (lowercase once, reuse for all checks)
+        low = date_str.lower()
+        if 'ago' in low:
+            # Phrasings without a number ("a day ago") carry no usable
+            # offset - fall through rather than fabricate a date
+            count = _leading_int(low)
+            if count is not None:
+                if 'day' in low:
+                    return datetime.now() - timedelta(days=count)
+                elif 'hour' in low:
+                    return datetime.now() - timedelta(hours=count)
+
+        # Handle standard date formats
+        if _dateutil_parser is not None:
+            return _dateutil_parser.parse(date_str)
+        return None
+
+    except Exception:
+        return None
+
+
+def extract_host(url: str) -> str:
+    """
+    Extract the lowercased host from an http(s) URL without a full urlparse.
+
+    Handles the 99% http(s) case with two string scans; anything without a
+    scheme separator falls back to urlparse.
+    """
+    start = url.find('://')
+    if start == -1:
+        return urlparse(url).netloc.lower()
+    start += 3
+    end = start
+    length = len(url)
+    while end < length and url[end] not in '/?#':
+        end += 1
+    return url[start:end].lower()
+
+
+# Hoisted so the tuple isn't rebuilt on every (uncached) classification
+_JOB_INDICATORS = ('/job/', '/jobs/', '/career/', '/careers/', '/position/',
+                   '/opening/', '/listings/')
+
+
+@functools.lru_cache(maxsize=4096)
+def is_job_detail_url(url: str) -> bool:
+    """Heuristic to identify job detail URLs (memoized - pure function of the URL)"""
+    low = url.lower()
+    return any(indicator in low for indicator in _JOB_INDICATORS)
+
+
+# Patterns with an unambiguous category - anything else goes to the LLM
+_SKIP_LINK_RE = re.compile(
+    r'/(?:login|signin|signup|register|privacy|terms|about|contact|blog|press|cookies?)(?:/|$)',
+    re.IGNORECASE)
+_NAV_LINK_RE = re.compile(r'(?:[?&]page=\d+|/page/\d+)', re.IGNORECASE)
+_LISTING_LINK_RE = re.compile(
+    r'/(?:jobs|careers|listings|vacancies|search)/?(?:\?|$)', re.IGNORECASE)
+_JOB_DETAIL_LINK_RE = re.compile(
+    r'/(?:job|jobs|career|careers|position|opening|listings)/[^/?#]+', re.IGNORECASE)
+
+
+def classify_link_heuristic(href: str, text: str = "") -> Optional[str]:
+    """
+    Cheap local classification of a link before involving the LLM.
+
+    Returns "job_detail", "listing", "nav" or "skip" for unambiguous URL
+    patterns, or None when the LLM should decide.
+    """
+    low = href.lower()
+    if _SKIP_LINK_RE.search(low):
+        return "skip"
+    if _NAV_LINK_RE.search(low):
+        return "nav"
+    if _LISTING_LINK_RE.search(low):
+        return "listing"
+    if _JOB_DETAIL_LINK_RE.search(low):
+        return "job_detail"
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _backoff_schedule(delay: float, retries: int) -> Tuple[float, ...]:
+    """Exponential backoff waits for a (delay, retries) pair, computed once
+    per distinct configuration rather than per call"""
+    return tuple(delay * (1 << i) for i in range(retries))
+
+
+async def with_retry_and_rate_limit(state: AgentState, operation, *args, **kwargs):
+    """Execute operation with retry logic and per-domain rate limiting"""
+    from util import rate_limit
+
+    # Rate-limit on the target URL's domain so concurrent tasks on other
+    # domains aren't serialized behind a single global timestamp
+    target_url = args[0] if args and isinstance(args[0], str) else None
+
+    for attempt in range(state.max_retries):
+        try:
+            if target_url:
+                await rate_limit.acquire(target_url)
+            else:
+                await state.rate_limit_delay()
+            result = await operation(*args, **kwargs)
+            state.reset_retry_count()
+            return result
+
+        except Exception as e:
+            state.retry_count = attempt + 1
+            error_msg = f"Attempt {attempt + 1}/{state.max_retries} failed: {str(e)}"
+
+            if attempt == state.max_retries - 1:
+                state.record_error(f"Operation failed after {state.max_retries} attempts: {str(e)}")
+                return None
+            else:
+                # Jitter prevents concurrent tasks from retrying in lockstep
+                wait_time = _backoff_schedule(
+                    state.delay_between_requests, state.max_retries
+                )[attempt]
+                wait_time += random.random() * 0.1 * wait_time
+                logger.warning("%s. Retrying in %.1fs...", error_msg, wait_time)
+                await asyncio.sleep(wait_time)
+
+    return None
+
+
+# Keeps the QueueListener alive (and stoppable) after setup_logging returns
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging():
+    """Set up logging configuration.
+
+    Log records are funneled through a queue so file/console I/O happens on
+    a background thread instead of blocking the event loop at each log call.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler('job_scraper.log')
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    # Configure the root logger directly: basicConfig would attach its own
+    # formatter to the QueueHandler and pre-format records before the
+    # listener's handlers format them again
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+
+
+def shutdown_logging():
+    """Flush queued log records and stop the background listener thread"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+@functools.lru_cache(maxsize=1)
+def validate_environment():
+    """Validate required environment variables (memoized - the .env file is
+    read and checked once per process, not on every call)"""
+    load_dotenv()
+
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    if not OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY not found in environment variables. Please add it to your .env file.")
+
+    logger.info("🔑 Environment variables loaded successfully")
+    logger.info(f"🤖 OpenAI API Key: {'*' * 10 + OPENAI_API_KEY[-4:] if OPENAI_API_KEY else 'NOT SET'}")
+
+    return OPENAI_API_KEY
+
+
+def normalize_url(url: str, use_furl: bool = False) -> str:
+    """
+    Normalize a URL: lowercase host, drop fragment, trailing slash, and
+    tracking parameters.
+
+    Thin wrapper keeping the cached implementation hashable-safe: the same
+    URLs are re-normalized thousands of times across a crawl (every visited
+    and queued URL on every validation pass), so results are memoized.
+
+    The default path is a single stdlib urlsplit plus a manual query filter;
+    pass use_furl=True for the old furl-based canonicalizer, which builds and
+    re-serializes a full furl object per URL.
+    """
+    if not isinstance(url, str):
+        return url
+    if use_furl and _furl is not None:
+        return _normalize_url_furl(url)
+    # Fast path: most same-domain crawl URLs are already canonical, so a few
+    # substring scans let us alias the input without parsing anything
+    needs_work = (
+        '#' in url
+        or url.endswith('/')
+        or url.endswith('?')  # bare query separator with nothing after it
+        or '/?' in url  # trailing slash hidden before a query string
+        or ('?' in url and any(marker in url for marker in _TRACKING_MARKERS))
+        or _has_upper_in_host(url)
+    )
+    if not needs_work:
+        return url
+    return _normalize_url_cached(url)
+
+
+def _has_upper_in_host(url: str) -> bool:
+    """Scan only the netloc slice for uppercase characters"""
+    start = url.find('://')
+    if start == -1:
+        return True  # no scheme separator - force the full normalizer
+    start += 3
+    end = url.find('/', start)
+    if end == -1:
+        end = len(url)
+    return any(c.isupper() for c in url[start:end])
+
+
+@functools.lru_cache(maxsize=131072)
+def _normalize_url_cached(url: str) -> str:
+    """Hot path: one urlsplit, one reassembly, no intermediate objects"""
+    try:
+        scheme, netloc, path, query, _ = urlsplit(url)
+
+        netloc = netloc.lower()
+
+        # Remove trailing slash from path (unless root)
+        if path != '/':
+            path = path.rstrip('/')
+
+        # Remove common tracking parameters. The pairs are filtered
+        # textually rather than through parse_qsl/urlencode: re-encoding
+        # rewrites clean queries (%20 -> +, / -> %2F, ...), which would make
+        # this path disagree with the fast path's untouched return
+        if query:
+            kept = [pair for pair in query.split('&')
+                    if pair.split('=', 1)[0] not in _TRACKING_PARAMS]
+            query = '&'.join(kept)
+
+        return urlunsplit((scheme, netloc, path, query, ''))
+
+    except Exception as e:
+        logger.warning(f"Failed to normalize URL {url}: {e}")
+        return url
+
+
+@functools.lru_cache(maxsize=131072)
+def _normalize_url_furl(url: str) -> str:
+    """Legacy furl-based normalization, kept behind normalize_url(use_furl=True)"""
+    try:
+        # Parse URL with furl
+        f = _furl(url, fragment=None)
+
+        # Remove fragment
+        # f.fragment = None
+
+        # Normalize host (lowercase)
+        if f.host:
+            f.host = f.host.lower()
+
+        # Remove trailing slash from path (unless root)
+        if f.path.segments and f.path.segments[-1] == '':
+            f.path.segments.pop()
+
+        # Remove common tracking parameters (C-level set intersection
+        # instead of a Python contains-check per parameter)
+        for param in _TRACKING_PARAMS.intersection(f.args):
+            del f.args[param]
+
+        return f.url
+
+    except Exception as e:
+        logger.warning(f"Failed to normalize URL {url} with furl: {e}")
+        # Fallback to original URL
+        return url
+
+
+def validate_and_filter_links(
+        links: List[str],
+        current_url: str,
+        normalized_visited: Set[str],
+        normalized_queue: Set[str],
+        base_domain: Optional[str] = None
+) -> Tuple[List[str], Set[str]]:
+    """
+    Validate and filter links before adding to queue
+
+    Args:
+        links: List of URLs to validate
+        current_url: Current page URL
+        normalized_visited: Pre-normalized set of already visited URLs
+        normalized_queue: Pre-normalized set of queued URLs
+        base_domain: Optional base domain to restrict to
+
+    Returns:
+        Tuple of (validated unique links, their normalized forms) so the
+        caller can union the new entries into its own sets in O(len(valid))
+
+    The caller owns the visited/queue collections and maintains their
+    normalized mirrors at insertion time (AgentState does this), so this
+    function no longer re-normalizes every known URL on every call.
+    """
+    if not links:
+        return [], set()
+
+    # Drop exact duplicates first (one C-level pass, order-preserving) -
+    # scraped link lists repeat the same nav links on every page
+    links = list(dict.fromkeys(links))
+
+    logger.debug("🔍 Validating %d links...", len(links))
+
+    # Get base domain if not provided
+    if not base_domain:
+        try:
+            base_domain = extract_host(current_url) or None
+        except:
+            base_domain = None
+
+    valid_links = []
+    seen_normalized = set()
+
+    # Local aliases skip the per-iteration attribute lookups in the hot loop
+    _append = valid_links.append
+    _add = seen_normalized.add
+    _debug = logger.debug
+    _search = _SKIP_RE.search
+
+    # Checks run cheapest-first so expensive work (normalization last) only
+    # happens for links that survive every inexpensive filter
+    for link in links:
+        try:
+            # Basic URL validation
+            if not link or not isinstance(link, str):
+                continue
+
+            # One integer compare rejects pathological URLs before any parsing
+            if len(link) > 500:  # Extremely long URLs are suspicious
+                _debug("⚠️ URL too long: %s", link)
+                continue
+
+            # Must be HTTP/HTTPS (also rejects javascript:, mailto:, tel:, ftp:)
+            if not link.startswith(_ALLOWED_SCHEMES):
+                _debug("⚠️ Skipping non-HTTP link: %s", link)
+                continue
+
+            # Skip common non-content URLs
+            if _search(link):
+                _debug("⚠️ Skipping pattern match: %s", link)
+                continue
+
+            # Host extract doubles as the structure check - no full urlparse
+            link_host = extract_host(link)
+            if not link_host:
+                _debug("⚠️ Skipping invalid URL: %s", link)
+                continue
+
+            # ⭐ UPDATED: Strict domain validation (no external links allowed)
+            if base_domain and link_host != base_domain:
+                _debug("⚠️ External link blocked: %s (domain: %s)", link, link_host)
+                continue
+
+            # Normalize for comparison - the most expensive step, so last
+            normalized_link = normalize_url(link)
+
+            # Skip if already processed (visited, queued, or seen in this batch)
+            if normalized_link in normalized_visited:
+                _debug("⚠️ Already visited: %s", link)
+                continue
+
+            if normalized_link in normalized_queue:
+                _debug("⚠️ Already in queue: %s", link)
+                continue
+
+            if normalized_link in seen_normalized:
+                _debug("⚠️ Duplicate in current batch: %s", link)
+                continue
+
+            # Add to valid links
+            _append(link)  # Keep original URL, not normalized
+            _add(normalized_link)
+
+        except Exception as e:
+            logger.warning("⚠️ Error validating link %s: %s", link, e)
+            continue
+
+    logger.info("✅ Validated %d unique links from %d candidates", len(valid_links), len(links))
+
+    # Log some examples for debugging (guarded - the slice itself allocates)
+    if valid_links and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📋 Sample valid links: %s", valid_links[:3])
+
+    return valid_links, seen_normalized
\ No newline at end of file
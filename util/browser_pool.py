@@ -0,0 +1,51 @@
+import asyncio
+from typing import Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+from playwright.async_api import async_playwright, Browser, Playwright
+
+# Module-level singletons: one Playwright driver and one Chromium process are
+# shared across all agents instead of forking a fresh browser per URL
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_lock = asyncio.Lock()
+
+
+async def get_browser() -> Browser:
+    """
+    Return the shared headless Chromium instance, launching it on first use.
+
+    Callers should open their own context/page via browser.new_context() and
+    close only that context - never the browser itself.
+    """
+    global _playwright, _browser
+    async with _lock:
+        if _browser is None or not _browser.is_connected():
+            # Relaunch path (e.g. Chromium crashed): stop the old driver
+            # before replacing it, or its process lingers for the whole run
+            if _playwright is not None:
+                try:
+                    await _playwright.stop()
+                except Exception:
+                    logger.debug("🌐 Old Playwright driver was already gone")
+                _playwright = None
+                _browser = None
+            logger.info("🌐 Launching shared Chromium browser...")
+            _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True)
+    return _browser
+
+
+async def close_browser() -> None:
+    """Shut down the shared browser and Playwright driver (e.g. at end of run)"""
+    global _playwright, _browser
+    async with _lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+        logger.debug("🌐 Shared browser closed")
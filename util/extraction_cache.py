@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Cache key version - bump when the extraction prompt or schema changes so
+# stale entries are never replayed against a newer pipeline
+PROMPT_VERSION = "v1"
+
+
+def cache_dir() -> Optional[str]:
+    """
+    Resolve the on-disk cache directory from the environment.
+
+    The cache is opt-in: without JOB_EXTRACTOR_CACHE_DIR set the pipeline
+    stays stateless and every page goes through the LLM.
+    """
+    directory = os.getenv("JOB_EXTRACTOR_CACHE_DIR")
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def make_key(model: str, page_content: str, user_preference: str) -> str:
+    """
+    Content-addressable cache key for one extraction call.
+
+    Keyed on (model, prompt version, page content, user preference) so a hit
+    means the exact same extraction was already performed.
+    """
+    raw = (
+        model.encode() + b"\x00" + PROMPT_VERSION.encode() + b"\x00" +
+        page_content.encode() + b"\x00" + user_preference.encode()
+    )
+    return hashlib.sha256(raw).hexdigest()
+
+
+def get(key: str) -> Optional[dict]:
+    """Return the cached extraction payload for key, or None on miss"""
+    directory = cache_dir()
+    if not directory:
+        return None
+
+    path = os.path.join(directory, f"{key}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        payload = entry.get("extraction")
+        if not isinstance(payload, dict):
+            raise ValueError("malformed cache entry")
+        logger.info(f"💾 Extraction cache hit: {key[:12]}…")
+        return payload
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Corrupt entries are evicted rather than surfaced to the caller
+        logger.warning(f"⚠️ Evicting unreadable cache entry {key[:12]}…: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def put(key: str, payload: dict) -> None:
+    """Store a validated extraction payload under key with a UTC timestamp"""
+    directory = cache_dir()
+    if not directory:
+        return
+
+    path = os.path.join(directory, f"{key}.json")
+    entry = {
+        "cached_at": datetime.now(timezone.utc).isoformat(),
+        "extraction": payload,
+    }
+    try:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        logger.debug(f"💾 Cached extraction: {key[:12]}…")
+    except OSError as e:
+        logger.warning(f"⚠️ Failed to write cache entry {key[:12]}…: {e}")
@@ -0,0 +1,44 @@
+import functools
+
+from langchain_openai import ChatOpenAI
+
+from model.models import JobExtraction, LinkCategorization
+
+import logging
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "gpt-4o-mini"
+
+# Built once at import: with_structured_output otherwise reflects the JSON
+# schema out of the Pydantic model on every binding, and a fixed dict gives
+# the extraction cache a stable schema fingerprint
+JOB_EXTRACTION_SCHEMA = JobExtraction.model_json_schema()
+LINK_CATEGORIZATION_SCHEMA = LinkCategorization.model_json_schema()
+
+
+# Lazily-built singletons: one ChatOpenAI client (and its httpx connection
+# pool) shared across all agents instead of re-initializing per call. Built
+# on first use rather than at import so .env is loaded before the client
+# reads the API key.
+
+@functools.lru_cache(maxsize=1)
+def get_llm() -> ChatOpenAI:
+    """Return the shared ChatOpenAI client"""
+    logger.debug(f"🤖 Initializing shared {MODEL_NAME} client")
+    return ChatOpenAI(model=MODEL_NAME, temperature=0)
+
+
+@functools.lru_cache(maxsize=1)
+def get_job_extractor():
+    """Shared structured-output runnable for JobExtraction"""
+    return get_llm().with_structured_output(
+        schema=JOB_EXTRACTION_SCHEMA, method="json_schema", include_raw=False
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_link_categorizer():
+    """Shared structured-output runnable for LinkCategorization"""
+    return get_llm().with_structured_output(
+        schema=LINK_CATEGORIZATION_SCHEMA, method="json_schema", include_raw=False
+    )
@@ -0,0 +1,174 @@
+import asyncio
+import json
+from typing import Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+import logging
+logger = logging.getLogger(__name__)
+
+BATCH_MODEL = "gpt-4o-mini"
+MAX_BATCH_SIZE = 50       # flush immediately once this many requests are queued
+LINGER_SECONDS = 1.0      # otherwise wait briefly for more requests to batch up
+POLL_INTERVAL_SECONDS = 10.0
+
+# Batch mode is opt-in: run_job_scraper enables it for non-streaming runs,
+# streaming keeps the online per-call path for real-time feedback
+_enabled = False
+_batcher: Optional["LLMBatcher"] = None
+
+
+def enable() -> None:
+    """Route structured LLM calls through the OpenAI Batch API (50% cost)"""
+    global _enabled
+    _enabled = True
+    logger.info("📦 LLM batch mode enabled (OpenAI Batch API)")
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def get_batcher() -> "LLMBatcher":
+    """Return the shared process-wide batcher, creating it on first use"""
+    global _batcher
+    if _batcher is None:
+        _batcher = LLMBatcher()
+    return _batcher
+
+
+class LLMBatcher:
+    """
+    Queue structured-output LLM requests and dispatch them as one OpenAI
+    Batch API job instead of individual online completions.
+
+    submit() returns once the batch containing the request completes; a
+    short linger window lets concurrent callers (e.g. the semaphore-bounded
+    extraction tasks) coalesce into a single batch.
+    """
+
+    def __init__(self, model: str = BATCH_MODEL,
+                 max_batch_size: int = MAX_BATCH_SIZE,
+                 linger: float = LINGER_SECONDS):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.linger = linger
+        self._pending: List[dict] = []
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._schemas: Dict[str, Type[BaseModel]] = {}
+        self._seq = 0
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._client = None
+
+    async def submit(self, prompt: str, schema: Type[BaseModel]) -> BaseModel:
+        """
+        Queue one chat-completion request constrained to the given Pydantic
+        schema and await its validated result
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        async with self._lock:
+            self._seq += 1
+            custom_id = f"req-{self._seq}"
+            self._futures[custom_id] = future
+            self._schemas[custom_id] = schema
+            self._pending.append({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "temperature": 0,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "response_format": {
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": schema.__name__,
+                            "schema": schema.model_json_schema(),
+                        },
+                    },
+                },
+            })
+
+            if len(self._pending) >= self.max_batch_size:
+                self._start_flush()
+            elif self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._linger_then_flush())
+
+        return await future
+
+    def _start_flush(self) -> None:
+        """Drain the pending queue into a background batch job (lock held)"""
+        if not self._pending:
+            return
+        requests = self._pending
+        self._pending = []
+        asyncio.create_task(self._run_batch(requests))
+
+    async def _linger_then_flush(self) -> None:
+        await asyncio.sleep(self.linger)
+        async with self._lock:
+            self._start_flush()
+
+    async def _run_batch(self, requests: List[dict]) -> None:
+        custom_ids = [r["custom_id"] for r in requests]
+        try:
+            await self._dispatch(requests)
+        except Exception as e:
+            logger.error(f"❌ Batch job failed: {e}")
+            for custom_id in custom_ids:
+                future = self._futures.pop(custom_id, None)
+                self._schemas.pop(custom_id, None)
+                if future and not future.done():
+                    future.set_exception(e)
+
+    async def _dispatch(self, requests: List[dict]) -> None:
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI()
+        client = self._client
+
+        payload = "\n".join(json.dumps(r) for r in requests).encode()
+        upload = await client.files.create(file=("batch.jsonl", payload), purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"📦 Submitted batch {batch.id} with {len(requests)} requests")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            custom_id = entry.get("custom_id")
+            future = self._futures.pop(custom_id, None)
+            schema = self._schemas.pop(custom_id, None)
+            if future is None or future.done():
+                continue
+            try:
+                content = entry["response"]["body"]["choices"][0]["message"]["content"]
+                future.set_result(schema.model_validate(json.loads(content)))
+            except Exception as e:
+                future.set_exception(
+                    RuntimeError(f"Failed to parse batch response for {custom_id}: {e}")
+                )
+
+        # Requests the batch never answered must not hang their callers
+        for custom_id in [r["custom_id"] for r in requests]:
+            future = self._futures.pop(custom_id, None)
+            self._schemas.pop(custom_id, None)
+            if future and not future.done():
+                future.set_exception(
+                    RuntimeError(f"No batch response received for {custom_id}")
+                )
@@ -0,0 +1,56 @@
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Matches the old global pacing (one request per 2s, i.e. 0.5 tokens/s) but
+# applied per domain, so concurrent work on different hosts never serializes
+DEFAULT_RATE = 0.5
+DEFAULT_BURST = 2
+
+
+class TokenBucket:
+    """Async token bucket: refills at `rate` tokens/second up to `burst`"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request token is available, then consume it"""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            logger.debug(f"⏱️ Rate limiting: waiting {wait_time:.1f}s")
+            await asyncio.sleep(wait_time)
+
+
+# Module-level registry rather than Pydantic state: limiters hold locks and
+# monotonic clocks that must be shared across all tasks in the process
+_domain_limiters: Dict[str, TokenBucket] = {}
+
+
+async def acquire(url_or_domain: str) -> None:
+    """Await a request token for the given URL's domain"""
+    domain = (
+        urlparse(url_or_domain).netloc
+        if "://" in url_or_domain else url_or_domain
+    )
+    bucket = _domain_limiters.get(domain)
+    if bucket is None:
+        bucket = _domain_limiters.setdefault(domain, TokenBucket())
+    await bucket.acquire()
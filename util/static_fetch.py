@@ -0,0 +1,71 @@
+from typing import Dict, List, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+from util import extract_host, is_job_detail_url
+
+try:
+    import httpx
+    import lxml.html
+except ImportError:
+    httpx = None
+    logger.debug("httpx/lxml not available, static fetch disabled")
+
+# A static page is only trusted when it exposes a real link set; below this
+# we assume the content is rendered client-side and fall back to the browser
+MIN_STATIC_ANCHORS = 20
+
+
+async def fetch_static_links(url: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Probe a URL with a plain HTTP fetch and return its same-domain links if
+    the server-side HTML already contains job links.
+
+    Returns None when the page looks client-rendered (or the probe fails),
+    signalling the caller to fall back to the Playwright path. Skipping the
+    browser saves 1-3s of startup plus the scroll/settle waits per page.
+    """
+    if httpx is None:
+        return None
+
+    try:
+        async with httpx.AsyncClient(
+            http2=True, follow_redirects=True, timeout=10
+        ) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+
+        tree = lxml.html.fromstring(response.text)
+        tree.make_links_absolute(url)
+        anchors = tree.xpath('//a[@href]')
+        if len(anchors) <= MIN_STATIC_ANCHORS:
+            logger.debug(f"🌫️ Static probe of {url}: too few anchors ({len(anchors)})")
+            return None
+
+        # One cheap host extraction per link instead of a full urlparse
+        base_host = extract_host(url)
+        links = []
+        seen = set()
+        for anchor in anchors:
+            href = anchor.get('href')
+            if not href or not href.startswith(('http://', 'https://')):
+                continue
+            if extract_host(href) != base_host:
+                continue
+            text = anchor.text_content().strip()
+            if not text or href in seen:
+                continue
+            seen.add(href)
+            links.append({'href': href, 'text': text, 'context': ''})
+
+        if not any(is_job_detail_url(link['href']) for link in links):
+            logger.debug(f"🌫️ Static probe of {url}: no job links, trying browser")
+            return None
+
+        logger.info(f"⚡ Static fetch served {len(links)} links for {url} (no browser)")
+        return links
+
+    except Exception as e:
+        logger.debug(f"🌫️ Static probe of {url} failed ({e}), falling back to browser")
+        return None